@@ -15,17 +15,23 @@ Relevant API documentation:
 """
 
 
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 import csv
 from datetime import datetime, timedelta
+from functools import lru_cache
+import itertools
 import json
 import re
 import gzip
+import hashlib
+import io
 import os
 import shutil
+import time
 import requests
-import matplotlib.pyplot as plt
-from matplotlib.ticker import MaxNLocator
-import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 class ConnectionFailure(Exception):
@@ -48,12 +54,166 @@ class AdobeAPI:
         adobe_api = AdobeAPI('config.json')
     """
 
-    def __init__(self, config_path="config.json", timeout=10):
+    # event type lookup table, used to convert eventType numbers to descriptions
+    EVENT_TYPES = {
+        0: "No Category",
+        1: "Login failed",
+        2: "Login successful",
+        3: "Admin Action",
+        4: "Security setting change",
+        5: "Report viewed",
+        6: "Report downloaded",
+        7: "Alert sent",
+        8: "User Action",
+        9: "Tool viewed",
+        10: "Adobe Action",
+        11: "Password Recovery",
+        12: "BookMarks",
+        13: "Dashboards",
+        14: "Alerts",
+        15: "Calendar Events",
+        16: "Targets",
+        17: "Report Settings",
+        18: "Scheduled Reports",
+        19: "Exclude By IP",
+        20: "Name Pages",
+        21: "Classifications",
+        22: "Data Sources",
+        23: "Workspace Project",
+        24: "Segment",
+        25: "Calculated Metric",
+        26: "Date Range",
+        27: "Virtual Report Suite",
+        28: "Contribution Analysis",
+        30: "Excel Data Block Request",
+        31: "Excel Login Failure",
+        32: "Excel Login Success",
+        41: "Mobile Login Failure",
+        42: "Mobile Login Success",
+        61: "Api Method",
+    }
+
+    # EVENT_TYPES keyed by both the int and str form of each code, as the API returns str
+    _EVENT_TYPE_LOOKUP = {
+        **EVENT_TYPES,
+        **{str(code): description for code, description in EVENT_TYPES.items()},
+    }
+
+    # Adobe events for s.events, matched against the eventDescription field
+    EVENT_NAMES = {
+        "event1": "project created",
+        "event2": "project viewed",
+        "event3": "project updated",
+        "event4": "project deleted",
+        "event5": "sharing project",
+        "event6": "segment created",
+        "event7": "segment updated",
+        "event8": "segment deleted",
+        "event9": "sharing segment",
+        "event10": "calculated metric created",
+        "event11": "calculated metric updated",
+        "event12": "calculated metric deleted",
+        "event13": "sharing calculated metric",
+        "event14": "date range created",
+        "event15": "date range updated",
+        "event16": "date range deleted",
+        "event17": "sharing date range",
+        "event18": "virtual report suite created",
+        "event19": "virtual report suite updated",
+        "event20": "virtual report suite deleted",
+        "event21": "alert created",
+        "event22": "alert updated",
+        "event23": "alert deleted",
+        "event24": "sharing alert",
+        "event25": "delivered alert",
+        "event26": "classification",
+        "event27": "viewed permissions",
+        "event28": "viewed company",
+        "event29": "viewed logs",
+        "event30": "successful login",
+        "event31": "login failed",
+        "event32": "api operation",
+    }
+
+    # EVENT_NAMES lowercased once up front, in the order they are matched
+    _EVENT_PHRASES = tuple((key, value.lower()) for key, value in EVENT_NAMES.items())
+
+    # Buffer size for copying and writing large files, well above the defaults to cut syscalls
+    _BUFFER_SIZE = 1024 * 1024
+
+    # gzip compression level. Level 1 is much faster than the default of 9, for a
+    # slightly larger file
+    _GZIP_LEVEL = 1
+
+    # Number of log entries encoded by each json.dumps call when writing a JSON list
+    _WRITE_BATCH_SIZE = 1000
+
+    # Added to a date to get the last second of that day, for inclusive date ranges
+    END_OF_DAY = timedelta(days=1, seconds=-1)
+
+    # Start of unix time, as a naive UTC datetime, for converting timestamps without
+    # the deprecated datetime.utcfromtimestamp
+    _UNIX_EPOCH = datetime(1970, 1, 1)
+
+    # Column headers for the Bulk Data Import CSV
+    BULK_IMPORT_COLUMNS = [
+        "reportSuiteID",
+        "Timestamp",
+        "marketingCloudVisitorID",
+        "pageName",
+        "userAgent",
+        "eVar1",
+        "eVar2",
+        "eVar3",
+        "eVar4",
+        "eVar5",
+        "eVar6",
+        "eVar7",
+        "events",
+    ]
+
+    # regex for component info in the eventDescription field, compiled once per process
+    _COMPONENT_RE = re.compile(
+        r"Name=(?P<name>.*?)\sId=(?P<id>\S+)(?:\sOwner=(?P<owner>.*))?"
+    )
+
+    def __init__(
+        self,
+        config_path="config.json",
+        timeout=10,
+        max_workers=8,
+        cache_dir=None,
+        cache_ttl=24 * 60 * 60,
+    ):
         self.config = self._load_config(config_path)
         self.timeout = timeout
+        self.max_workers = max_workers
+        self.cache_dir = cache_dir
+        self.cache_ttl = cache_ttl
         self.access_token = None
         self.company_id = self.config["company_id"]
         self.session = requests.Session()
+
+        # Retry rate limited (429) and transient server errors with exponential backoff,
+        # honouring Retry-After. POSTs aren't retried, so a bulk data insertion is never
+        # sent twice. Once retries run out the last response is returned as normal.
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+
+        # Size the connection pool so each concurrent request gets its own connection
+        self.session.mount(
+            "https://",
+            HTTPAdapter(
+                max_retries=retry,
+                pool_connections=max_workers,
+                pool_maxsize=max_workers,
+            ),
+        )
         self._connect()
 
     def _load_config(self, config_path):
@@ -83,7 +243,7 @@ class AdobeAPI:
         )
 
         if response.status_code == 200:
-            self.access_token = response.json()["access_token"]
+            self.access_token = json.loads(response.content)["access_token"]
             self.session.headers.update(
                 {
                     "Authorization": f"Bearer {self.access_token}",
@@ -110,18 +270,40 @@ class AdobeAPI:
         :return: A tuple of the start date and end date as datetime objects
         """
         # Parse start_date and end_date strings as datetime objects
-        start_date_dt = datetime.strptime(start_date, "%Y-%m-%d")
-        end_date_dt = datetime.strptime(end_date, "%Y-%m-%d")
+        start_date_dt = self._parse_date(start_date)
+        end_date_dt = self._parse_date(end_date)
 
         # Raise ValueError if start_date is after end_date
         if start_date_dt > end_date_dt:
             raise ValueError("Start date must be before or equal to end date")
 
         # Adjust end_date to be inclusive: add one day and subtract one second
-        end_date_dt += timedelta(days=1, seconds=-1)
+        end_date_dt += self.END_OF_DAY
 
         return start_date_dt, end_date_dt
 
+    def _parse_date(self, date_string):
+        """
+        Parse a date string in the format YYYY-MM-DD as a datetime object.
+        Zero-padded dates are built directly, as datetime.strptime is slow;
+        anything else is left to strptime, so the same strings are accepted.
+
+        :param date_string: The date in the format YYYY-MM-DD
+        :return: The date as a datetime object
+        :raises: ValueError if the string is not a valid date in the format YYYY-MM-DD
+        """
+        if (
+            len(date_string) == 10
+            and date_string[4] == "-"
+            and date_string[7] == "-"
+            and (date_string[:4] + date_string[5:7] + date_string[8:]).isdigit()
+        ):
+            return datetime(
+                int(date_string[:4]), int(date_string[5:7]), int(date_string[8:])
+            )
+
+        return datetime.strptime(date_string, "%Y-%m-%d")
+
     def get_usage_audit_logs(
         # pylint: disable=invalid-name
         self,
@@ -134,6 +316,7 @@ class AdobeAPI:
         event_type=None,
         event=None,
         limit=1000,
+        output_path=None,
     ):
         """
         Get usage audit logs.
@@ -147,14 +330,47 @@ class AdobeAPI:
         :param event_type: The event type
         :param event: The event
         :param limit: The number of items to fetch per page
-        :return: A list of usage audit logs
+        :param output_path: If set, the logs are written to this file page by page
+            instead of being returned. A path ending in .jsonl is written as JSON Lines,
+            so only the pages in flight are held in memory.
+        :return: A list of usage audit logs, or the number of logs written if output_path is set
         """
-        all_data = []
+        print(f"Fetching usage audit logs for {start_date} to {end_date}...")
+
+        logs = self._iter_usage_audit_logs(
+            company_id, start_date, end_date, login, ip, rsid, event_type, event, limit
+        )
 
-        start_date_dt = datetime.strptime(start_date, "%Y-%m-%d")
-        end_date_dt = datetime.strptime(end_date, "%Y-%m-%d")
+        if output_path is None:
+            all_data = list(logs)
+            row_count = len(all_data)
+        else:
+            row_count = self._write_logs(output_path, logs)
 
-        print(f"Fetching usage audit logs for {start_date} to {end_date}...")
+        print(f"Fetching usage audit logs finished. Fetched {row_count} rows of data")
+        return all_data if output_path is None else row_count
+
+    def _iter_usage_audit_logs(
+        # pylint: disable=invalid-name
+        self,
+        company_id,
+        start_date,
+        end_date,
+        login,
+        ip,
+        rsid,
+        event_type,
+        event,
+        limit,
+    ):
+        """
+        Fetch usage audit logs, yielding each log as its page arrives.
+        See get_usage_audit_logs for the parameters.
+
+        :return: A generator of usage audit logs
+        """
+        start_date_dt = self._parse_date(start_date)
+        end_date_dt = self._parse_date(end_date)
 
         while start_date_dt <= end_date_dt:
             current_start_date = start_date_dt
@@ -170,54 +386,205 @@ class AdobeAPI:
             start_date_str = current_start_date.strftime("%Y-%m-%dT%H:%M:%S")
             end_date_str = current_end_date.strftime("%Y-%m-%dT%H:%M:%S")
 
-            page = 0
-            has_more_pages = True
+            url = f"https://analytics.adobe.io/api/{company_id}/auditlogs/usage"
+
+            params = {
+                "startDate": start_date_str,
+                "endDate": end_date_str,
+                "limit": limit,
+            }
+
+            optional_params = {
+                "login": login,
+                "ip": ip,
+                "rsid": rsid,
+                "eventType": event_type,
+                "event": event,
+            }
+
+            for key, value in optional_params.items():
+                if value:
+                    params[key] = value
 
             print(f"Fetching data chunk for {start_date_str} to {end_date_str}...")
 
-            while has_more_pages:
-                url = f"https://analytics.adobe.io/api/{company_id}/auditlogs/usage"
+            # Only cache the pages of a chunk that ended over a day ago (allowing for
+            # time zones), as its logs can no longer change. Otherwise page 0's
+            # totalPages and the later pages could come from different snapshots,
+            # duplicating or dropping logs.
+            cache = current_end_date < datetime.now() - timedelta(days=1)
+
+            # Fetch the first page on its own to find out how many pages there are
+            data_page = self._get_usage_audit_logs_page(url, params, 0, cache)
+            yield from data_page["content"]
+            total_pages = data_page["totalPages"]
+            print(f"Fetched page 1 of {total_pages}")
+
+            # The remaining pages don't depend on each other, so fetch them concurrently.
+            # executor.map yields results in page order, so the output order is unchanged.
+            if not data_page["lastPage"]:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    data_pages = executor.map(
+                        lambda page: self._get_usage_audit_logs_page(
+                            url, params, page, cache
+                        ),
+                        range(1, total_pages),
+                    )
+                    for page, data_page in enumerate(data_pages, start=2):
+                        yield from data_page["content"]
+                        print(f"Fetched page {page} of {total_pages}")
 
-                params = {
-                    "startDate": start_date_str,
-                    "endDate": end_date_str,
-                    "limit": limit,
-                    "page": page,
-                }
+            # Start the next chunk at midnight on the following day. Adding a day to
+            # current_end_date would give 23:59:59, and skip a final single-day chunk
+            start_date_dt = current_start_date + timedelta(days=90)
 
-                optional_params = {
-                    "login": login,
-                    "ip": ip,
-                    "rsid": rsid,
-                    "eventType": event_type,
-                    "event": event,
-                }
+    def _get_usage_audit_logs_page(self, url, params, page, cache):
+        """
+        Get a single page of usage audit logs.
+
+        :param url: The usage audit logs endpoint URL
+        :param params: The request parameters, excluding the page number
+        :param page: The page number to fetch, starting from 0
+        :param cache: Whether the page may be cached, if cache_dir is set
+        :return: The page of usage audit logs
+        :raises: RequestFailure if there's an error making the request
+        """
+        return self._get_json(url, {**params, "page": page}, cache)
 
-                for key, value in optional_params.items():
-                    if value:
-                        params[key] = value
+    def _get_json(self, url, params, cache=True):
+        """
+        Make a GET request and return the response JSON.
+        If cache_dir is set, responses are cached on disk for cache_ttl seconds,
+        so re-running over the same date range doesn't fetch the same pages again.
+
+        :param url: The endpoint URL
+        :param params: The request parameters
+        :param cache: Whether the response may be cached, if cache_dir is set
+        :return: The response JSON
+        :raises: RequestFailure if there's an error making the request
+        """
+        cache_file_path = None
 
-                response = self.session.get(url, params=params, timeout=self.timeout)
+        if self.cache_dir and cache:
+            cache_key = hashlib.sha256(
+                json.dumps([url, params], sort_keys=True).encode("utf-8")
+            ).hexdigest()
+            cache_file_path = os.path.join(self.cache_dir, f"{cache_key}.json.gz")
 
-                if response.status_code == 200:
-                    data_page = response.json()
-                    all_data.extend(data_page["content"])
-                    has_more_pages = not data_page["lastPage"]
-                    print(f"Fetched page {page+1} of {data_page['totalPages']}")
+            try:
+                if time.time() - os.path.getmtime(cache_file_path) < self.cache_ttl:
+                    with gzip.open(cache_file_path, "rb") as cache_file:
+                        return json.loads(cache_file.read())
+            except FileNotFoundError:
+                pass
+
+        response = self.session.get(url, params=params, timeout=self.timeout)
+
+        if response.status_code != 200:
+            raise RequestFailure(
+                f"Request failed with status code: {response.status_code}"
+                f"\nResponse text: {response.text}"
+            )
+
+        if cache_file_path:
+            # Write to a sibling file first so a partly written entry is never read
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_file_path = cache_file_path + ".tmp"
+            with gzip.open(
+                tmp_file_path, "wb", compresslevel=self._GZIP_LEVEL
+            ) as cache_file:
+                cache_file.write(response.content)
+            os.replace(tmp_file_path, cache_file_path)
+
+        # Parse the raw bytes directly, rather than response.json() decoding them to str first
+        return json.loads(response.content)
+
+    def _read_logs(self, json_file_path):
+        """
+        Read the log entries from a JSON file, one at a time.
+        A path ending in .jsonl is read as JSON Lines, with one entry per line, so only
+        one entry is held in memory at a time. Otherwise the file should contain a JSON
+        list of entries, which is loaded all at once.
+
+        :param json_file_path: The path to the JSON file
+        :return: A generator of log entries
+        """
+        with open(
+            json_file_path, "r", encoding="utf-8", buffering=self._BUFFER_SIZE
+        ) as json_file:
+            if json_file_path.endswith(".jsonl"):
+                for line in json_file:
+                    if line.strip():
+                        yield json.loads(line)
+            else:
+                yield from json.load(json_file)
+
+    def _write_logs(self, json_file_path, logs):
+        """
+        Write log entries to a JSON file, in the format given by its extension (see _read_logs).
+        The entries are written to a sibling .tmp file which then replaces the original,
+        so logs can be streamed from a file and written back to the same path.
+
+        json.dumps without an indent uses the C encoder, whereas json.dump
+        always falls back to the much slower pure Python one. A JSON list is encoded
+        in batches, as each json.dumps call has a fixed overhead of its own.
+
+        :param json_file_path: The path to the JSON file
+        :param logs: An iterable of log entries
+        :return: The number of log entries written
+        """
+        tmp_file_path = json_file_path + ".tmp"
+        row_count = 0
+
+        try:
+            with open(
+                tmp_file_path, "w", encoding="utf-8", buffering=self._BUFFER_SIZE
+            ) as json_file:
+                if json_file_path.endswith(".jsonl"):
+                    for log in logs:
+                        json_file.write(json.dumps(log) + "\n")
+                        row_count += 1
                 else:
-                    raise RequestFailure(
-                        f"Request failed with status code: {response.status_code}"
-                        f"\nResponse text: {response.text}"
-                    )
+                    # Write the list a batch at a time, matching json.dumps(list(logs)),
+                    # as the items of each batch are encoded with the same separator
+                    logs = iter(logs)
+                    json_file.write("[")
+                    while True:
+                        batch = list(itertools.islice(logs, self._WRITE_BATCH_SIZE))
+                        if not batch:
+                            break
+                        if row_count:
+                            json_file.write(", ")
+                        json_file.write(json.dumps(batch)[1:-1])
+                        row_count += len(batch)
+                    json_file.write("]")
+        except BaseException:
+            # Leave the original file as it was, without a partial .tmp file beside it
+            if os.path.exists(tmp_file_path):
+                os.remove(tmp_file_path)
+            raise
+
+        os.replace(tmp_file_path, json_file_path)
+        return row_count
+
+    def _update_logs(self, json_file_path, update):
+        """
+        Update each entry of a JSON file in turn, streaming the entries from the file
+        and writing them back to it. For a .jsonl file only one entry is held in memory
+        at a time.
 
-                page += 1
+        :param json_file_path: The path to the JSON file
+        :param update: A function called with the index of each entry and the entry,
+            which it updates in place
+        :return: The number of log entries written
+        """
 
-            start_date_dt = current_end_date + timedelta(days=1)
+        def updated_logs():
+            for i, entry in enumerate(self._read_logs(json_file_path)):
+                update(i, entry)
+                yield entry
 
-        print(
-            f"Fetching usage audit logs finished. Fetched {len(all_data)} rows of data"
-        )
-        return all_data
+        return self._write_logs(json_file_path, updated_logs())
 
     def update_event_types(self, json_file_path):
         """
@@ -226,76 +593,42 @@ class AdobeAPI:
 
         :param json_file_path: The path to the JSON file
         """
-        # event lookup table
-        event_types_dict = {
-            0: "No Category",
-            1: "Login failed",
-            2: "Login successful",
-            3: "Admin Action",
-            4: "Security setting change",
-            5: "Report viewed",
-            6: "Report downloaded",
-            7: "Alert sent",
-            8: "User Action",
-            9: "Tool viewed",
-            10: "Adobe Action",
-            11: "Password Recovery",
-            12: "BookMarks",
-            13: "Dashboards",
-            14: "Alerts",
-            15: "Calendar Events",
-            16: "Targets",
-            17: "Report Settings",
-            18: "Scheduled Reports",
-            19: "Exclude By IP",
-            20: "Name Pages",
-            21: "Classifications",
-            22: "Data Sources",
-            23: "Workspace Project",
-            24: "Segment",
-            25: "Calculated Metric",
-            26: "Date Range",
-            27: "Virtual Report Suite",
-            28: "Contribution Analysis",
-            30: "Excel Data Block Request",
-            31: "Excel Login Failure",
-            32: "Excel Login Success",
-            41: "Mobile Login Failure",
-            42: "Mobile Login Success",
-            61: "Api Method",
-        }
+        self._update_logs(json_file_path, self._update_event_type)
+        print(f"update_event_types function updated JSON file: {json_file_path}")
 
-        with open(json_file_path, "r", encoding="utf-8") as json_file:
-            json_data = json.load(json_file)
+    def _update_event_type(self, i, event):
+        """
+        Convert the eventType of a single log entry from a number to a useful description.
 
-        for i, event in enumerate(json_data):
-            try:
-                event_type = event.get("eventType")
-                if event_type is None:
-                    event["eventType"] = "Unknown Event Type"
+        :param i: The index of the entry, used in error messages
+        :param event: The log entry, updated in place
+        """
+        event_type = event.get("eventType")
+
+        # Known codes, the vast majority, need only a single dict lookup
+        if isinstance(event_type, (str, int)) and event_type in self._EVENT_TYPE_LOOKUP:
+            event["eventType"] = self._EVENT_TYPE_LOOKUP[event_type]
+            return
+
+        try:
+            if event_type is None:
+                event["eventType"] = "Unknown Event Type"
+            else:
+                event_type_int = (
+                    int(event_type) if isinstance(event_type, (str, int)) else None
+                )
+                if event_type_int in self.EVENT_TYPES:
+                    event["eventType"] = self.EVENT_TYPES[event_type_int]
                 else:
-                    event_type_int = (
-                        int(event_type) if isinstance(event_type, (str, int)) else None
-                    )
-                    if event_type_int in event_types_dict:
-                        event["eventType"] = event_types_dict[event_type_int]
-                    else:
-                        event["eventType"] = "Unknown Event Type: " + str(
-                            event_type_int
-                        )
-            except KeyError as error:
-                print(f"Error processing event {i}: {event}")
-                print(f"Error message: {error}")
-                print()
-            except ValueError as error:
-                print(f"Error processing event {i}: {event}")
-                print(f"Error message: {error}")
-                print()
-
-        # write the updated JSON file
-        with open(json_file_path, "w", encoding="utf-8") as json_file:
-            json.dump(json_data, json_file, indent=4)
-            print(f"update_event_types function updated JSON file: {json_file_path}")
+                    event["eventType"] = "Unknown Event Type: " + str(event_type_int)
+        except KeyError as error:
+            print(f"Error processing event {i}: {event}")
+            print(f"Error message: {error}")
+            print()
+        except ValueError as error:
+            print(f"Error processing event {i}: {event}")
+            print(f"Error message: {error}")
+            print()
 
     def add_component_info(self, json_file_path):
         """
@@ -304,36 +637,43 @@ class AdobeAPI:
 
         :param json_file_path: The path to the JSON file
         """
-        # regex pattern for component info
-        pattern = r"Name=(?P<name>.*?)\sId=(?P<id>\S+)(?:\sOwner=(?P<owner>.*))?"
-
-        # Read the JSON data from the file
-        with open(json_file_path, "r", encoding="utf-8") as json_file:
-            json_data = json.load(json_file)
-
-        updated_data = []
-        regex = re.compile(pattern)
+        self._update_logs(
+            json_file_path, lambda i, item: self._add_component_info(item)
+        )
+        print(f"add_component_info function updated JSON file: {json_file_path}")
 
-        # Loop through each entry in the JSON data
-        for item in json_data:
-            event_description = item.get("eventDescription", "")
+    def _add_component_info(self, item):
+        """
+        Add the component name, ID and owner to a single log entry.
 
-            match = regex.search(event_description)
-            if match:
-                item["componentName"] = match.group("name").strip()
-                item["componentId"] = match.group("id").strip()
-                item["componentOwner"] = (
-                    match.group("owner").strip()
-                    if "owner" in match.groupdict() and match.group("owner")
-                    else "N/A"
-                )
+        :param item: The log entry, updated in place
+        """
+        component_info = self._parse_component_info(item.get("eventDescription", ""))
+        if component_info:
+            (
+                item["componentName"],
+                item["componentId"],
+                item["componentOwner"],
+            ) = component_info
+
+    @staticmethod
+    @lru_cache(maxsize=65536)
+    def _parse_component_info(event_description):
+        """
+        Parse the component name, ID and owner from an eventDescription.
+        The results are cached, as the same descriptions come up again and again
+        in the logs, e.g. each time a popular project is viewed.
 
-            updated_data.append(item)
+        :param event_description: The eventDescription of a log entry
+        :return: A (name, ID, owner) tuple, or None if there is no component info
+        """
+        match = AdobeAPI._COMPONENT_RE.search(event_description)
+        if not match:
+            return None
 
-        # Write the updated JSON data to the file
-        with open(json_file_path, "w", encoding="utf-8") as json_file:
-            json.dump(updated_data, json_file, indent=4)
-            print(f"add_component_info function updated JSON file: {json_file_path}")
+        # Unpack all three groups in one call, rather than building a groupdict
+        name, component_id, owner = match.groups()
+        return name.strip(), component_id.strip(), owner.strip() if owner else "N/A"
 
     def add_adobe_events(self, json_file_path):
         """
@@ -341,237 +681,287 @@ class AdobeAPI:
 
         :param json_file_path: The path to the JSON file
         """
+        # run through the JSON file and add a new event field based on EVENT_NAMES
+        self._update_logs(json_file_path, lambda i, entry: self._add_adobe_event(entry))
+        print(f"add_adobe_events function updated JSON file: {json_file_path}")
 
-        event_name_dict = {
-            "event1": "project created",
-            "event2": "project viewed",
-            "event3": "project updated",
-            "event4": "project deleted",
-            "event5": "sharing project",
-            "event6": "segment created",
-            "event7": "segment updated",
-            "event8": "segment deleted",
-            "event9": "sharing segment",
-            "event10": "calculated metric created",
-            "event11": "calculated metric updated",
-            "event12": "calculated metric deleted",
-            "event13": "sharing calculated metric",
-            "event14": "date range created",
-            "event15": "date range updated",
-            "event16": "date range deleted",
-            "event17": "sharing date range",
-            "event18": "virtual report suite created",
-            "event19": "virtual report suite updated",
-            "event20": "virtual report suite deleted",
-            "event21": "alert created",
-            "event22": "alert updated",
-            "event23": "alert deleted",
-            "event24": "sharing alert",
-            "event25": "delivered alert",
-            "event26": "classification",
-            "event27": "viewed permissions",
-            "event28": "viewed company",
-            "event29": "viewed logs",
-            "event30": "successful login",
-            "event31": "login failed",
-            "event32": "api operation",
-        }
+    def _add_adobe_event(self, entry):
+        """
+        Set the event field of a single log entry, for use in s.events.
 
-        # run through the JSON file and add a new event field based on the event_name_dict
-        with open(json_file_path, "r", encoding="utf-8") as json_file:
-            json_data = json.load(json_file)
+        :param entry: The log entry, updated in place
+        """
+        event_description = entry["eventDescription"].lower()
+
+        # Use the first event phrase present in the eventDescription, or "" if none are
+        entry["event"] = next(
+            (
+                event_key
+                for event_key, event_phrase in self._EVENT_PHRASES
+                if event_phrase in event_description
+            ),
+            "",
+        )
 
-        # Loop through each entry in the JSON data
-        for entry in json_data:
-            # Set a default value for the "event" field
-            entry["event"] = ""
-            event_description = entry["eventDescription"].lower()
+    def enrich_logs(self, json_file_path):
+        """
+        Enrich the JSON file in a single pass.
+        Applies the update_event_types, add_adobe_events and add_component_info
+        enrichments to each entry in turn, so the file is only read and written once.
 
-            # Check if any event keyword from the dictionary is present in the eventDescription
-            for event_key, event_value in event_name_dict.items():
-                if event_value.lower() in event_description:
-                    entry["event"] = event_key
-                    break
+        :param json_file_path: The path to the JSON file
+        """
+        self._update_logs(json_file_path, self._enrich_log)
+        print(f"enrich_logs function updated JSON file: {json_file_path}")
 
-        # write the updated JSON file
-        with open(json_file_path, "w", encoding="utf-8") as json_file:
-            json.dump(json_data, json_file, indent=4)
-            print(f"add_adobe_events function updated JSON file: {json_file_path}")
+    def _enrich_log(self, i, entry):
+        """
+        Apply all of the enrichments to a single log entry.
 
-    def write_to_csv_for_bulk_import(self, json_file_path, csv_file_path, rsid):
+        :param i: The index of the entry, used in error messages
+        :param entry: The log entry, updated in place
+        """
+        self._update_event_type(i, entry)
+        self._add_adobe_event(entry)
+        self._add_component_info(entry)
+
+    def write_to_csv_for_bulk_import(
+        self, json_file_path, csv_file_path, rsid, compress=False
+    ):
         """
         Write the JSON data to a CSV file in the correct format for the Bulk Data Import API.
 
         :param json_file_path: The path to the JSON file
         :param csv_file_path: The path to the CSV file
-        :param usage_rsid: The usage report suite ID
+        :param rsid: The usage report suite ID
+        :param compress: Whether to write the CSV gzipped, to csv_file_path + ".gz",
+            ready for upload without a separate compression step
+        :return: The path the CSV file was written to
         """
-        report_suite_id = rsid
+        logs = self._read_logs(json_file_path)
 
-        with open(json_file_path, "r", encoding="utf-8") as json_file, open(
-            csv_file_path, "w", newline="", encoding="utf-8"
-        ) as csv_file:
-            csv_writer = csv.writer(csv_file)
-            csv_writer.writerow(
-                [
-                    "reportSuiteID",
-                    "Timestamp",
-                    "marketingCloudVisitorID",
-                    "pageName",
-                    "userAgent",
-                    "eVar1",
-                    "eVar2",
-                    "eVar3",
-                    "eVar4",
-                    "eVar5",
-                    "eVar6",
-                    "eVar7",
-                    "events",
-                ]
-            )
+        if compress:
+            csv_file_path += ".gz"
 
-            for log in json.load(json_file):
-                event_desc_full = f"{log['eventType']};{log['eventDescription']}"
+        with self._open_csv(csv_file_path, "w") as csv_file:
+            csv_writer = csv.writer(csv_file)
+            csv_writer.writerow(self.BULK_IMPORT_COLUMNS)
 
-                # Set timestamp to the dateCreated field, converted to unix timestamp
-                timestamp = int(datetime.fromisoformat(log["dateCreated"]).timestamp())
+            # Hand all rows to the writer in one call rather than one writerow per log
+            csv_writer.writerows(self._bulk_import_rows(logs, rsid))
 
-                # if login is not null, set marketingCloudVisitorID to the login field, without the @domain
-                # otherwise, set marketingCloudVisitorID to "unknown"
-                if log["login"] is None:
-                    marketing_cloud_visitor_id = "unknown"
-                else:
-                    login = log["login"].split("@")[0]
-                    marketing_cloud_visitor_id = login
+        print(f"Data written to {csv_file_path}")
+        return csv_file_path
 
-                # Set s.pagename to the event_desc field
-                s_pagename = event_desc_full
+    def _bulk_import_rows(self, logs, report_suite_id):
+        """
+        Generate the Bulk Data Import CSV rows for the log entries.
 
-                # Set evars
-                evar_1 = login
-                evar_2 = event_desc_full
-                evar_3 = log["eventType"]
-                evar_4 = log["eventDescription"]
-                # using log.get() to avoid KeyError if the key is not present
-                evar_5 = log.get("componentId", "")
-                evar_6 = log.get("componentName", "")
-                evar_7 = log.get("componentOwner", "")
-
-                # set events to the event field
-                events = log["event"]
-
-                # Write values to CSV row
-                csv_writer.writerow(
-                    [
-                        report_suite_id,
-                        timestamp,
-                        marketing_cloud_visitor_id,
-                        s_pagename,
-                        "filler_user_agent",
-                        evar_1,
-                        evar_2,
-                        evar_3,
-                        evar_4,
-                        evar_5,
-                        evar_6,
-                        evar_7,
-                        events,
-                    ]
-                )
+        :param logs: An iterable of enriched log entries
+        :param report_suite_id: The usage report suite ID
+        :return: A generator of CSV rows, matching BULK_IMPORT_COLUMNS
+        """
+        for log in logs:
+            event_desc_full = f"{log['eventType']};{log['eventDescription']}"
 
-        print(f"Data written to {csv_file_path}")
+            # Set timestamp to the dateCreated field, converted to unix timestamp
+            timestamp = int(datetime.fromisoformat(log["dateCreated"]).timestamp())
 
-    def data_sense_check(self, csv_file_path):
+            # if login is not null, set marketingCloudVisitorID to the login field, without the @domain
+            # otherwise, set marketingCloudVisitorID to "unknown"
+            if log["login"] is None:
+                marketing_cloud_visitor_id = "unknown"
+            else:
+                marketing_cloud_visitor_id = log["login"].split("@")[0]
+
+            yield [
+                report_suite_id,
+                timestamp,
+                marketing_cloud_visitor_id,
+                # s.pagename
+                event_desc_full,
+                "filler_user_agent",
+                # eVar1 to eVar7
+                marketing_cloud_visitor_id,
+                event_desc_full,
+                log["eventType"],
+                log["eventDescription"],
+                # using log.get() to avoid KeyError if the key is not present
+                log.get("componentId", ""),
+                log.get("componentName", ""),
+                log.get("componentOwner", ""),
+                # events
+                log["event"],
+            ]
+
+    def data_sense_check(self, csv_file_path, plot=False):
         """
         Perform a data sense check on the CSV file.
+        Prints the minimum and maximum datetimes and the number of rows for each date.
 
         :param csv_file_path: The path to the CSV file
+        :param plot: Whether to also show a bar chart of rows over time
+        :raises: ValueError if the CSV file has no Timestamp column
         """
-        # Read the CSV file
-        data = pd.read_csv(csv_file_path)
+        min_timestamp = None
+        max_timestamp = None
+        day_counts = Counter()
+
+        # Only the Timestamp column is needed, so parse that and skip the rest of each row
+        with self._open_csv(csv_file_path) as csv_file:
+            reader = csv.reader(csv_file)
+            header = next(reader, None)
+
+            if header is None:
+                print(f"No header row found in {csv_file_path}")
+                return
+            if "Timestamp" not in header:
+                raise ValueError(f"No Timestamp column found in {csv_file_path}")
+            timestamp_index = header.index("Timestamp")
 
-        # Convert the timestamp to datetime format
-        data["Datetime"] = pd.to_datetime(data["Timestamp"], unit="s")
+            for row in reader:
+                timestamp = int(row[timestamp_index])
+                if min_timestamp is None or timestamp < min_timestamp:
+                    min_timestamp = timestamp
+                if max_timestamp is None or timestamp > max_timestamp:
+                    max_timestamp = timestamp
 
-        # Calculate the maximum and minimum dates
-        min_date = data["Datetime"].min()
-        max_date = data["Datetime"].max()
+                # Count rows per UTC day, as whole days since the unix epoch
+                day_counts[timestamp // 86400] += 1
+
+        if min_timestamp is None:
+            print(f"No rows found in {csv_file_path}")
+            return
+
+        min_date = self._UNIX_EPOCH + timedelta(seconds=min_timestamp)
+        max_date = self._UNIX_EPOCH + timedelta(seconds=max_timestamp)
         print(f"Minimum Datetime from data_sense_check: {min_date}")
         print(f"Maximum Datetime from data_sense_check: {max_date}")
 
         # Count the occurrences of each date
-        date_counts = data["Datetime"].dt.date.value_counts().sort_index()
+        date_counts = {
+            (self._UNIX_EPOCH + timedelta(days=day)).date(): count
+            for day, count in sorted(day_counts.items())
+        }
+        print("Row count per date from data_sense_check:")
+        for row_date, count in date_counts.items():
+            print(f"{row_date}: {count}")
+
+        if not plot:
+            return
+
+        # matplotlib is slow to import, so only import it when a chart is requested
+        # pylint: disable=import-outside-toplevel
+        import matplotlib.pyplot as plt
+        from matplotlib.ticker import MaxNLocator
 
         # Create a bar chart of rows over time with one bar per day
         plt.figure(figsize=(10, 5))
-        axis = date_counts.plot(kind="bar")
+        plt.bar([str(row_date) for row_date in date_counts], date_counts.values())
         plt.title("Rows Over Time")
         plt.xlabel("Date")
         plt.ylabel("Row Count")
         plt.xticks(rotation=90)  # Angle x-axis labels to 90 degrees
 
         # Set the maximum number of x-axis ticks
-        axis.xaxis.set_major_locator(MaxNLocator(integer=True, prune="both", nbins=20))
+        plt.gca().xaxis.set_major_locator(
+            MaxNLocator(integer=True, prune="both", nbins=20)
+        )
 
         plt.show()
 
-    def gzip_file(self, file_path):
+    def _open_csv(self, csv_file_path, mode="r"):
+        """
+        Open a CSV file in text mode, gzip compressing or decompressing it if the path ends in .gz.
+
+        :param csv_file_path: The path to the CSV file
+        :param mode: "r" to read or "w" to write
+        :return: The open file object
+        """
+        if csv_file_path.endswith(".gz"):
+            return gzip.open(
+                csv_file_path,
+                mode + "t",
+                compresslevel=self._GZIP_LEVEL,
+                encoding="utf-8",
+                newline="",
+            )
+
+        return open(
+            csv_file_path,
+            mode,
+            encoding="utf-8",
+            newline="",
+            buffering=self._BUFFER_SIZE,
+        )
+
+    def _gzip_csv(self, csv_file_path):
         """
-        Gzip a file.
+        Gzip a CSV file in memory, ready to be uploaded.
 
-        :param file_path: The path to the file to gzip
-        :return: The path to the gzipped file
+        :param csv_file_path: The path to the CSV file to gzip
+        :return: A file-like object containing the gzipped CSV
         """
-        gzip_file_path = file_path + ".gz"
+        gzip_buffer = io.BytesIO()
 
-        with open(file_path, "rb") as src_file, gzip.open(
-            gzip_file_path, "wb"
+        with open(csv_file_path, "rb") as src_file, gzip.GzipFile(
+            fileobj=gzip_buffer, mode="wb", compresslevel=self._GZIP_LEVEL
         ) as dest_file:
-            shutil.copyfileobj(src_file, dest_file)
+            shutil.copyfileobj(src_file, dest_file, length=self._BUFFER_SIZE)
 
-        return gzip_file_path
+        gzip_buffer.seek(0)
+        return gzip_buffer
 
-    def validate_csv(self, csv_file_path):
+    def _post_csv(self, url, csv_file_path):
         """
-        Validate a CSV file using Adobe's validation endpoint.
+        Gzip a CSV file and send it to one of the bulk data insertion endpoints.
 
-        :param csv_file_path: The path to the CSV file to be validated
-        :return: The response from the validation endpoint
+        :param url: The endpoint URL
+        :param csv_file_path: The path to the CSV file to be sent
+        :return: The response JSON from the endpoint
         :raises: RequestFailure if there's an error making the request
         """
-        url = "https://analytics-collection.adobe.io/aa/collect/v1/events/validate"
-
-        # Add additional headers for this specific request
+        # Additional headers required by the bulk data insertion endpoints
         additional_headers = {
             "accept": "application/json",
             "x-adobe-vgid": "usage_group1",
         }
-        self.session.headers.update(additional_headers)
 
-        # Gzip the file
-        gzip_file_path = self.gzip_file(csv_file_path)
-
-        # Make the request
-        with open(gzip_file_path, "rb") as file:
-            files = {"file": file}
-            response = self.session.post(url, files=files, timeout=self.timeout)
+        if csv_file_path.endswith(".gz"):
+            # Already gzipped, e.g. by write_to_csv_for_bulk_import(compress=True)
+            file_name = os.path.basename(csv_file_path)
+            with open(csv_file_path, "rb") as gzip_file:
+                file_data = gzip_file.read()
+        else:
+            # Gzip into memory rather than writing, re-reading and deleting a .gz file
+            file_name = os.path.basename(csv_file_path) + ".gz"
+            file_data = self._gzip_csv(csv_file_path)
 
-        # Clean up the gzipped file
-        os.remove(gzip_file_path)
+        files = {"file": (file_name, file_data)}
 
-        # Remove the additional headers after the request is complete
-        for header in additional_headers:
-            self.session.headers.pop(header, None)
+        response = self.session.post(
+            url, files=files, headers=additional_headers, timeout=self.timeout
+        )
 
         if response.status_code == 200:
-            validation_result = response.json()
-            return validation_result
+            return json.loads(response.content)
         else:
             raise RequestFailure(
                 f"Request failed with status code: {response.status_code}"
                 f"\nResponse text: {response.text}"
             )
 
+    def validate_csv(self, csv_file_path):
+        """
+        Validate a CSV file using Adobe's validation endpoint.
+
+        :param csv_file_path: The path to the CSV file to be validated
+        :return: The response from the validation endpoint
+        :raises: RequestFailure if there's an error making the request
+        """
+        url = "https://analytics-collection.adobe.io/aa/collect/v1/events/validate"
+        return self._post_csv(url, csv_file_path)
+
     def extract_rsid_and_date_range(self, csv_file_path):
         """
         Extract the report suite ID and date range from a CSV file.
@@ -581,13 +971,13 @@ class AdobeAPI:
         :param csv_file_path: The path to the CSV file
         :return: The report suite ID and date range
         """
-        with open(csv_file_path, "r", encoding="utf-8") as file:
+        with self._open_csv(csv_file_path) as file:
             reader = csv.reader(file)
             next(reader)  # Skip the header row
 
             rsid = None
-            min_date = None
-            max_date = None
+            min_timestamp = None
+            max_timestamp = None
 
             # Get the rsid and check it is consistent across all rows
             for row in reader:
@@ -597,14 +987,16 @@ class AdobeAPI:
                     if row[0] != rsid:
                         raise ValueError("Multiple report suite IDs found in the CSV")
 
-                # Get the date range
+                # Get the timestamp range, only converting the extremes to dates below
                 timestamp = int(row[1])
-                date = datetime.utcfromtimestamp(timestamp).date()
 
-                if min_date is None or date < min_date:
-                    min_date = date
-                if max_date is None or date > max_date:
-                    max_date = date
+                if min_timestamp is None or timestamp < min_timestamp:
+                    min_timestamp = timestamp
+                if max_timestamp is None or timestamp > max_timestamp:
+                    max_timestamp = timestamp
+
+            min_date = (self._UNIX_EPOCH + timedelta(seconds=min_timestamp)).date()
+            max_date = (self._UNIX_EPOCH + timedelta(seconds=max_timestamp)).date()
 
             print(f"Report Suite ID extracted from csv: {rsid}")
             print(f"Minimum Date extracted from csv: {min_date}")
@@ -670,7 +1062,7 @@ class AdobeAPI:
         )
 
         if response.status_code == 200:
-            response_json = response.json()
+            response_json = json.loads(response.content)
             print("Existing data check response:")
             print(response_json)
 
@@ -735,37 +1127,7 @@ class AdobeAPI:
 
         # If neither of the above exceptions are raised, proceed with the bulk data insertion
         url = "https://analytics-collection.adobe.io/aa/collect/v1/events"
-
-        # Add the additional headers required by the ingestion endpoint
-        additional_headers = {
-            "accept": "application/json",
-            "x-adobe-vgid": "usage_group1",
-        }
-        self.session.headers.update(additional_headers)
-
-        # Gzip the CSV file
-        gzip_file_path = self.gzip_file(csv_file_path)
-
-        # Send the gzipped file to the ingestion endpoint
-        with open(gzip_file_path, "rb") as file:
-            files = {"file": file}
-            response = self.session.post(url, files=files, timeout=self.timeout)
-
-        # Clean up the gzipped file
-        os.remove(gzip_file_path)
-
-        # Remove the additional headers after the request is complete
-        for header in additional_headers:
-            self.session.headers.pop(header, None)
-
-        if response.status_code == 200:
-            ingestion_result = response.json()
-            return ingestion_result
-        else:
-            raise RequestFailure(
-                f"Request failed with status code: {response.status_code}"
-                f"\nResponse text: {response.text}"
-            )
+        return self._post_csv(url, csv_file_path)
 
 
 ####################################################################################################
@@ -776,35 +1138,26 @@ if __name__ == "__main__":
     # Create an instance of the AdobeAPI class
     adobe_api = AdobeAPI("config.json")
 
-    # fetch all usage audit logs for a date range
-    all_usage_audit_logs = adobe_api.get_usage_audit_logs(
+    # fetch all usage audit logs for a date range, writing them to a local JSON Lines file
+    adobe_api.get_usage_audit_logs(
         adobe_api.company_id,
         start_date="2022-02-01",
         end_date="2022-02-28",  # inclusive
+        output_path="all_usage_audit_logs.jsonl",
     )
 
-    # Write the output to a local file
-    with open("all_usage_audit_logs.json", "w", encoding="utf-8") as f:
-        json.dump(all_usage_audit_logs, f, indent=4)
-
-    # update event types
-    adobe_api.update_event_types("all_usage_audit_logs.json")
-
-    # add Adobe events
-    adobe_api.add_adobe_events("all_usage_audit_logs.json")
-
-    # add component information
-    adobe_api.add_component_info("all_usage_audit_logs.json")
+    # update event types, add Adobe events and add component information
+    adobe_api.enrich_logs("all_usage_audit_logs.jsonl")
 
     # Write out to CSV for bulk import
     adobe_api.write_to_csv_for_bulk_import(
-        "all_usage_audit_logs.json",
+        "all_usage_audit_logs.jsonl",
         "all_usage_audit_logs.csv",
         rsid="your-rsid-goes-here",
     )
 
     # Sense check the data
-    adobe_api.data_sense_check("all_usage_audit_logs.csv")
+    adobe_api.data_sense_check("all_usage_audit_logs.csv", plot=True)
 
     # # Check for existing data
     # adobe_api.is_there_existing_data_for_date_range("all_usage_audit_logs.csv")
@@ -8,12 +8,17 @@ To run tests:
     etc
 """
 
-from datetime import datetime, timedelta
+import csv
+from datetime import datetime
+import gzip
 import json
 import os
+import random
 import tempfile
+import time
 import pytest
-from adobe_usage import AdobeAPI
+import requests
+from adobe_usage import AdobeAPI, RequestFailure
 
 
 class TestInclusiveDateRange:
@@ -29,9 +34,7 @@ class TestInclusiveDateRange:
         start_date = "2021-09-01"
         end_date = "2021-09-01"
         expected_start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-        expected_end_dt = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(
-            days=1, seconds=-1
-        )
+        expected_end_dt = datetime.strptime(end_date, "%Y-%m-%d") + AdobeAPI.END_OF_DAY
         result = your_class_instance.inclusive_date_range(start_date, end_date)
         assert result == (expected_start_dt, expected_end_dt)
 
@@ -40,12 +43,15 @@ class TestInclusiveDateRange:
         start_date = "2021-09-01"
         end_date = "2021-09-03"
         expected_start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-        expected_end_dt = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(
-            days=1, seconds=-1
-        )
+        expected_end_dt = datetime.strptime(end_date, "%Y-%m-%d") + AdobeAPI.END_OF_DAY
         result = your_class_instance.inclusive_date_range(start_date, end_date)
         assert result == (expected_start_dt, expected_end_dt)
 
+    def test_inclusive_date_range_end_of_day(self, your_class_instance):
+        """Test inclusive_date_range() ends on the last second of the end date"""
+        result = your_class_instance.inclusive_date_range("2021-09-01", "2021-09-03")
+        assert result[1] == datetime(2021, 9, 3, 23, 59, 59)
+
     def test_inclusive_date_range_invalid_date_format(self, your_class_instance):
         """Test inclusive_date_range() with invalid date format"""
         start_date = "2021/09/01"
@@ -65,9 +71,7 @@ class TestInclusiveDateRange:
         start_date = "2020-02-28"
         end_date = "2020-03-01"
         expected_start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-        expected_end_dt = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(
-            days=1, seconds=-1
-        )
+        expected_end_dt = datetime.strptime(end_date, "%Y-%m-%d") + AdobeAPI.END_OF_DAY
         result = your_class_instance.inclusive_date_range(start_date, end_date)
         assert result == (expected_start_dt, expected_end_dt)
 
@@ -94,11 +98,11 @@ class TestUpdateEventTypes:
     @pytest.fixture
     def json_file(self, json_data):
         """Fixture to create a temporary JSON file"""
-        with tempfile.NamedTemporaryFile(mode="w", delete=False) as temp_file:
-            json.dump(json_data, temp_file)
-            temp_file.flush()
-        yield temp_file.name
-        os.remove(temp_file.name)
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.write(fd, json.dumps(json_data).encode("utf-8"))
+        os.close(fd)
+        yield path
+        os.remove(path)
 
     def test_update_event_types(self, your_class_instance_instance, json_file):
         """Test update_event_types() with a sample JSON file"""
@@ -115,10 +119,9 @@ class TestUpdateEventTypes:
 
     def test_update_event_types_empty_json_file(self, your_class_instance_instance):
         """Test update_event_types() with an empty JSON file"""
-        with tempfile.NamedTemporaryFile(mode="w", delete=False) as temp_file:
-            json.dump([], temp_file)
-            temp_file.flush()
-            empty_json_file = temp_file.name
+        fd, empty_json_file = tempfile.mkstemp(suffix=".json")
+        os.write(fd, b"[]")
+        os.close(fd)
 
         your_class_instance_instance.update_event_types(empty_json_file)
 
@@ -164,13 +167,13 @@ class TestAddComponentInfo:
 
     @pytest.fixture
     def temp_json_file(self, sample_event_descriptions):
-        with tempfile.NamedTemporaryFile(mode="w+", delete=False) as temp_file:
-            json.dump(sample_event_descriptions, temp_file)
-            temp_file.flush()
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.write(fd, json.dumps(sample_event_descriptions).encode("utf-8"))
+        os.close(fd)
 
-        yield temp_file.name
+        yield path
 
-        os.remove(temp_file.name)
+        os.remove(path)
 
     def test_add_component_info(self, your_class_instance, temp_json_file):
         your_class_instance.add_component_info(temp_json_file)
@@ -218,3 +221,785 @@ class TestAddComponentInfo:
         )
         assert updated_data[5]["componentId"] == "s3954_6219d0b95315df22f82c3471"
         assert updated_data[5]["componentOwner"] == "Dave Smith"
+
+
+class TestEnrichLogs:
+    """Test class for enrich_logs()"""
+
+    @pytest.fixture
+    def your_class_instance(self):
+        """Fixture to instantiate your class"""
+        return AdobeAPI()
+
+    @pytest.fixture
+    def temp_json_file(self):
+        """Fixture to create a temporary JSON file"""
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.write(
+            fd,
+            json.dumps(
+                [
+                    {
+                        "eventType": "24",
+                        "eventDescription": "Segment Created: Name=Hit - Exclude LSFGGSL6 Segment Id=s3954_621c91e0fa093118dc8a2146 Owner=David Smith",
+                    },
+                    {"eventType": 2, "eventDescription": "Successful login"},
+                ],
+            ).encode("utf-8"),
+        )
+        os.close(fd)
+        yield path
+        os.remove(path)
+
+    def test_enrich_logs(self, your_class_instance, temp_json_file):
+        """Test enrich_logs() applies all three enrichments"""
+        your_class_instance.enrich_logs(temp_json_file)
+
+        with open(temp_json_file, "r", encoding="utf-8") as json_file:
+            updated_data = json.load(json_file)
+
+        assert updated_data[0]["eventType"] == "Segment"
+        assert updated_data[0]["event"] == "event6"
+        assert updated_data[0]["componentName"] == "Hit - Exclude LSFGGSL6 Segment"
+        assert updated_data[0]["componentId"] == "s3954_621c91e0fa093118dc8a2146"
+        assert updated_data[0]["componentOwner"] == "David Smith"
+
+        assert updated_data[1]["eventType"] == "Login successful"
+        assert updated_data[1]["event"] == "event30"
+        assert "componentName" not in updated_data[1]
+
+        assert not os.path.exists(temp_json_file + ".tmp")
+
+    def test_enrich_logs_error(self, your_class_instance, temp_json_file):
+        """Test enrich_logs() leaves the file unchanged if an entry can't be enriched"""
+        # The last entry has no eventDescription, so it can't be given an Adobe event
+        original_data = (
+            '[{"eventType": "2", "eventDescription": "Login"}, {"eventType": "2"}]'
+        )
+        with open(temp_json_file, "w", encoding="utf-8") as json_file:
+            json_file.write(original_data)
+
+        with pytest.raises(KeyError):
+            your_class_instance.enrich_logs(temp_json_file)
+
+        with open(temp_json_file, "r", encoding="utf-8") as json_file:
+            assert json_file.read() == original_data
+
+        assert not os.path.exists(temp_json_file + ".tmp")
+
+    def test_enrich_logs_json_lines(self, your_class_instance):
+        """Test enrich_logs() with a JSON Lines file"""
+        with tempfile.NamedTemporaryFile(
+            mode="w", suffix=".jsonl", delete=False
+        ) as temp_file:
+            temp_file.write('{"eventType": "2", "eventDescription": "Login failed"}\n')
+            temp_file.write(
+                '{"eventType": "61", "eventDescription": "API operation"}\n'
+            )
+            jsonl_file = temp_file.name
+
+        try:
+            your_class_instance.enrich_logs(jsonl_file)
+
+            with open(jsonl_file, "r", encoding="utf-8") as updated_file:
+                updated_data = [json.loads(line) for line in updated_file]
+        finally:
+            os.remove(jsonl_file)
+
+        assert updated_data == [
+            {
+                "eventType": "Login successful",
+                "eventDescription": "Login failed",
+                "event": "event31",
+            },
+            {
+                "eventType": "Api Method",
+                "eventDescription": "API operation",
+                "event": "event32",
+            },
+        ]
+
+
+class TestWriteToCsvForBulkImport:
+    """Test class for write_to_csv_for_bulk_import()"""
+
+    @pytest.fixture
+    def your_class_instance(self):
+        """Fixture to instantiate your class"""
+        return AdobeAPI()
+
+    @pytest.fixture
+    def temp_json_file(self):
+        """Fixture to create a temporary JSON file of enriched logs"""
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.write(
+            fd,
+            json.dumps(
+                [
+                    {
+                        "eventType": "Segment",
+                        "eventDescription": "Segment Created: Name=Test Segment Id=s3954_621c91e0fa093118dc8a2146 Owner=David Smith",
+                        "dateCreated": "2022-02-01T10:00:00-06:00",
+                        "login": "david.smith@example.com",
+                        "event": "event6",
+                        "componentName": "Test Segment",
+                        "componentId": "s3954_621c91e0fa093118dc8a2146",
+                        "componentOwner": "David Smith",
+                    },
+                    {
+                        "eventType": "Login successful",
+                        "eventDescription": "Successful login",
+                        "dateCreated": "2022-02-02T10:00:00-06:00",
+                        "login": None,
+                        "event": "event30",
+                    },
+                ],
+            ).encode("utf-8"),
+        )
+        os.close(fd)
+        yield path
+        os.remove(path)
+
+    @pytest.fixture
+    def csv_file_path(self):
+        """Fixture to provide a path for the output CSV file"""
+        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as temp_file:
+            pass
+        yield temp_file.name
+        os.remove(temp_file.name)
+
+    def test_write_to_csv_for_bulk_import(
+        self, your_class_instance, temp_json_file, csv_file_path
+    ):
+        """Test write_to_csv_for_bulk_import() writes one row per log"""
+        your_class_instance.write_to_csv_for_bulk_import(
+            temp_json_file, csv_file_path, rsid="test-rsid"
+        )
+
+        with open(csv_file_path, "r", encoding="utf-8", newline="") as csv_file:
+            rows = list(csv.reader(csv_file))
+
+        assert rows[0] == AdobeAPI.BULK_IMPORT_COLUMNS
+        assert len(rows) == 3
+
+        assert rows[1][:3] == ["test-rsid", "1643731200", "david.smith"]
+        assert rows[1][5] == "david.smith"
+        assert rows[1][9:] == [
+            "s3954_621c91e0fa093118dc8a2146",
+            "Test Segment",
+            "David Smith",
+            "event6",
+        ]
+
+        assert rows[2][:3] == ["test-rsid", "1643817600", "unknown"]
+        assert rows[2][5] == "unknown"
+        assert rows[2][9:] == ["", "", "", "event30"]
+
+    def test_write_to_csv_for_bulk_import_compressed(
+        self, your_class_instance, temp_json_file, csv_file_path
+    ):
+        """Test write_to_csv_for_bulk_import() with compress=True writes a readable .gz"""
+        gzip_file_path = your_class_instance.write_to_csv_for_bulk_import(
+            temp_json_file, csv_file_path, rsid="test-rsid", compress=True
+        )
+
+        try:
+            assert gzip_file_path == csv_file_path + ".gz"
+
+            with gzip.open(gzip_file_path, "rt", encoding="utf-8", newline="") as file:
+                rows = list(csv.reader(file))
+            assert len(rows) == 3
+
+            result = your_class_instance.extract_rsid_and_date_range(gzip_file_path)
+            assert result == ("test-rsid", "2022-02-01", "2022-02-02")
+        finally:
+            os.remove(gzip_file_path)
+
+
+class TestExtractRsidAndDateRange:
+    """Test class for extract_rsid_and_date_range()"""
+
+    @pytest.fixture
+    def your_class_instance(self):
+        """Fixture to instantiate your class"""
+        return AdobeAPI()
+
+    @pytest.fixture
+    def write_csv_file(self):
+        """Fixture to write rows to a temporary bulk import CSV file"""
+        file_paths = []
+
+        def _write_csv_file(rows):
+            with tempfile.NamedTemporaryFile(
+                mode="w", suffix=".csv", newline="", delete=False
+            ) as temp_file:
+                csv_writer = csv.writer(temp_file)
+                csv_writer.writerow(AdobeAPI.BULK_IMPORT_COLUMNS)
+                csv_writer.writerows(rows)
+            file_paths.append(temp_file.name)
+            return temp_file.name
+
+        yield _write_csv_file
+
+        for file_path in file_paths:
+            os.remove(file_path)
+
+    def test_extract_rsid_and_date_range(self, your_class_instance, write_csv_file):
+        """Test extract_rsid_and_date_range() with rows out of date order"""
+        csv_file_path = write_csv_file(
+            [
+                ["test-rsid", "1643817600"],  # 2022-02-02 16:00:00 UTC
+                ["test-rsid", "1643673600"],  # 2022-02-01 00:00:00 UTC
+                ["test-rsid", "1644019199"],  # 2022-02-04 23:59:59 UTC
+            ]
+        )
+        result = your_class_instance.extract_rsid_and_date_range(csv_file_path)
+        assert result == ("test-rsid", "2022-02-01", "2022-02-04")
+
+    def test_extract_rsid_and_date_range_multiple_rsids(
+        self, your_class_instance, write_csv_file
+    ):
+        """Test extract_rsid_and_date_range() with more than one report suite ID"""
+        csv_file_path = write_csv_file(
+            [["test-rsid", "1643817600"], ["other-rsid", "1643817600"]]
+        )
+        with pytest.raises(ValueError):
+            your_class_instance.extract_rsid_and_date_range(csv_file_path)
+
+
+class TestDataSenseCheck:
+    """Test class for data_sense_check()"""
+
+    @pytest.fixture
+    def your_class_instance(self):
+        """Fixture to instantiate your class"""
+        return AdobeAPI()
+
+    @pytest.fixture
+    def csv_file_path(self, tmp_path):
+        """Fixture to provide a path for a temporary CSV file"""
+        return str(tmp_path / "logs.csv")
+
+    def write_csv_file(self, csv_file_path, rows):
+        """Write rows to a CSV file"""
+        with open(csv_file_path, "w", encoding="utf-8", newline="") as csv_file:
+            csv.writer(csv_file).writerows(rows)
+
+    def test_data_sense_check(self, your_class_instance, csv_file_path, capsys):
+        """Test data_sense_check() prints the date range and the rows per day"""
+        self.write_csv_file(
+            csv_file_path,
+            [
+                ["reportSuiteID", "Timestamp"],
+                ["test-rsid", "1643817600"],  # 2022-02-02 16:00:00 UTC
+                ["test-rsid", "1643673600"],  # 2022-02-01 00:00:00 UTC
+                ["test-rsid", "1644019199"],  # 2022-02-04 23:59:59 UTC
+                ["test-rsid", "1643759999"],  # 2022-02-01 23:59:59 UTC
+            ],
+        )
+
+        your_class_instance.data_sense_check(csv_file_path)
+
+        assert capsys.readouterr().out.splitlines() == [
+            "Minimum Datetime from data_sense_check: 2022-02-01 00:00:00",
+            "Maximum Datetime from data_sense_check: 2022-02-04 23:59:59",
+            "Row count per date from data_sense_check:",
+            "2022-02-01: 2",
+            "2022-02-02: 1",
+            "2022-02-04: 1",
+        ]
+
+    def test_data_sense_check_header_only(
+        self, your_class_instance, csv_file_path, capsys
+    ):
+        """Test data_sense_check() with a header row but no data rows"""
+        self.write_csv_file(csv_file_path, [["reportSuiteID", "Timestamp"]])
+
+        your_class_instance.data_sense_check(csv_file_path)
+
+        assert capsys.readouterr().out == f"No rows found in {csv_file_path}\n"
+
+    def test_data_sense_check_empty_file(
+        self, your_class_instance, csv_file_path, capsys
+    ):
+        """Test data_sense_check() with an empty file"""
+        self.write_csv_file(csv_file_path, [])
+
+        your_class_instance.data_sense_check(csv_file_path)
+
+        assert capsys.readouterr().out == f"No header row found in {csv_file_path}\n"
+
+    def test_data_sense_check_no_timestamp_column(
+        self, your_class_instance, csv_file_path
+    ):
+        """Test data_sense_check() with no Timestamp column"""
+        self.write_csv_file(csv_file_path, [["reportSuiteID"], ["test-rsid"]])
+
+        with pytest.raises(ValueError, match="No Timestamp column"):
+            your_class_instance.data_sense_check(csv_file_path)
+
+
+class TestSessionRetries:
+    """Test class for the retry configuration of the requests session"""
+
+    @pytest.fixture
+    def your_class_instance(self):
+        """Fixture to instantiate your class"""
+        return AdobeAPI(max_workers=4)
+
+    def test_session_retries(self, your_class_instance):
+        """Test GETs are retried on rate limiting and transient server errors"""
+        adapter = your_class_instance.session.get_adapter(
+            "https://analytics.adobe.io/api/test/auditlogs/usage"
+        )
+        retry = adapter.max_retries
+
+        assert retry.total == 5
+        assert retry.backoff_factor == 0.5
+        assert set(retry.status_forcelist) == {429, 500, 502, 503, 504}
+        assert retry.respect_retry_after_header
+        assert not retry.raise_on_status
+        assert "GET" in retry.allowed_methods
+        assert adapter._pool_maxsize == 4
+
+    def test_session_post_not_retried(self, your_class_instance):
+        """Test POSTs are never retried, so a bulk data insertion isn't sent twice"""
+        adapter = your_class_instance.session.get_adapter(
+            "https://analytics-collection.adobe.io/aa/collect/v1/events"
+        )
+
+        assert "POST" not in adapter.max_retries.allowed_methods
+
+
+class TestGetJsonCache:
+    """Test class for the cache_dir option used by _get_json()"""
+
+    @pytest.fixture
+    def your_class_instance(self, tmp_path):
+        """Fixture to instantiate your class with a disk cache"""
+        return AdobeAPI(cache_dir=str(tmp_path))
+
+    @pytest.fixture
+    def requested_params(self, your_class_instance, monkeypatch):
+        """Fixture to replace session.get, recording the params of each request"""
+        requested_params = []
+
+        def fake_get(url, params=None, timeout=None):
+            requested_params.append(params)
+            response = requests.Response()
+            response.status_code = 200
+            response._content = json.dumps({"page": params["page"]}).encode("utf-8")
+            return response
+
+        monkeypatch.setattr(your_class_instance.session, "get", fake_get)
+        return requested_params
+
+    def test_get_json_cache_hit(self, your_class_instance, requested_params):
+        """Test _get_json() only requests the same URL and params once"""
+        url = "https://analytics.adobe.io/api/test/auditlogs/usage"
+
+        assert your_class_instance._get_json(url, {"page": 0}) == {"page": 0}
+        assert your_class_instance._get_json(url, {"page": 0}) == {"page": 0}
+        assert your_class_instance._get_json(url, {"page": 1}) == {"page": 1}
+
+        assert requested_params == [{"page": 0}, {"page": 1}]
+
+    def test_get_json_cache_expired(self, your_class_instance, requested_params):
+        """Test _get_json() requests again once the cache entry has expired"""
+        url = "https://analytics.adobe.io/api/test/auditlogs/usage"
+        your_class_instance.cache_ttl = 0
+
+        your_class_instance._get_json(url, {"page": 0})
+        your_class_instance._get_json(url, {"page": 0})
+
+        assert requested_params == [{"page": 0}, {"page": 0}]
+
+
+class TestGetUsageAuditLogsCache:
+    """Test class for which usage audit log pages are cached by cache_dir"""
+
+    @pytest.fixture
+    def your_class_instance(self, tmp_path):
+        """Fixture to instantiate your class with a disk cache"""
+        return AdobeAPI(cache_dir=str(tmp_path))
+
+    @pytest.fixture
+    def requested_params(self, your_class_instance, monkeypatch):
+        """Fixture to replace session.get with a fake single page usage endpoint"""
+        requested_params = []
+
+        def fake_get(url, params=None, timeout=None):
+            requested_params.append(params)
+            response = requests.Response()
+            response.status_code = 200
+            response._content = json.dumps(
+                {"content": [{}], "totalPages": 1, "lastPage": True}
+            ).encode("utf-8")
+            return response
+
+        monkeypatch.setattr(your_class_instance.session, "get", fake_get)
+        return requested_params
+
+    def test_past_date_range_cached(self, your_class_instance, requested_params):
+        """Test pages of a date range that has ended are only requested once"""
+        for _ in range(2):
+            your_class_instance.get_usage_audit_logs(
+                your_class_instance.company_id, "2022-01-01", "2022-01-31"
+            )
+
+        assert len(requested_params) == 1
+
+    def test_current_date_range_not_cached(self, your_class_instance, requested_params):
+        """Test pages of a date range ending today are requested every time"""
+        today = datetime.now().strftime("%Y-%m-%d")
+        for _ in range(2):
+            your_class_instance.get_usage_audit_logs(
+                your_class_instance.company_id, today, today
+            )
+
+        assert len(requested_params) == 2
+
+
+class TestGetUsageAuditLogs:
+    """Test class for get_usage_audit_logs()"""
+
+    TOTAL_PAGES = 4
+
+    @pytest.fixture
+    def your_class_instance(self):
+        """Fixture to instantiate your class"""
+        return AdobeAPI()
+
+    @pytest.fixture
+    def failing_pages(self):
+        """Fixture to provide the (startDate, page) of pages that should fail"""
+        return set()
+
+    @pytest.fixture
+    def requested_pages(self, your_class_instance, failing_pages, monkeypatch):
+        """
+        Fixture to replace session.get with a fake usage endpoint, recording the
+        (startDate, page) of each request. Each page takes a random time to arrive,
+        so concurrent pages complete out of order. Pages in failing_pages
+        return a 500 error.
+        """
+        requested_pages = []
+
+        def fake_get(url, params=None, timeout=None):
+            time.sleep(random.uniform(0, 0.01))
+            requested_pages.append((params["startDate"], params["page"]))
+
+            response = requests.Response()
+            if (params["startDate"], params["page"]) in failing_pages:
+                response.status_code = 500
+                response._content = b"Internal Server Error"
+                return response
+
+            response.status_code = 200
+            response._content = json.dumps(
+                {
+                    "content": [
+                        {"startDate": params["startDate"], "page": params["page"]},
+                        {"startDate": params["startDate"], "page": params["page"]},
+                    ],
+                    "totalPages": self.TOTAL_PAGES,
+                    "lastPage": params["page"] == self.TOTAL_PAGES - 1,
+                }
+            ).encode("utf-8")
+            return response
+
+        monkeypatch.setattr(your_class_instance.session, "get", fake_get)
+        return requested_pages
+
+    @pytest.fixture
+    def expected_pages(self):
+        """Fixture to provide the (startDate, page) of each page, in order"""
+        # The date range is split into chunks of at most 90 days
+        start_dates = [
+            "2022-01-01T00:00:00",
+            "2022-04-01T00:00:00",
+            "2022-06-30T00:00:00",
+        ]
+        return [
+            (start_date, page)
+            for start_date in start_dates
+            for page in range(self.TOTAL_PAGES)
+        ]
+
+    def test_get_usage_audit_logs(
+        self, your_class_instance, requested_pages, expected_pages
+    ):
+        """Test get_usage_audit_logs() returns the logs of every page in order"""
+        logs = your_class_instance.get_usage_audit_logs(
+            your_class_instance.company_id, "2022-01-01", "2022-06-30"
+        )
+
+        assert [(log["startDate"], log["page"]) for log in logs] == [
+            page for page in expected_pages for _ in range(2)
+        ]
+        assert sorted(requested_pages) == expected_pages
+
+    def test_get_usage_audit_logs_page_failure(
+        self, your_class_instance, requested_pages, failing_pages
+    ):
+        """Test get_usage_audit_logs() raises if a page after the first one fails"""
+        failing_pages.add(("2022-04-01T00:00:00", 2))
+
+        with pytest.raises(RequestFailure):
+            your_class_instance.get_usage_audit_logs(
+                your_class_instance.company_id, "2022-01-01", "2022-06-30"
+            )
+
+    def test_get_usage_audit_logs_json_lines_output(
+        self, your_class_instance, requested_pages, expected_pages, tmp_path
+    ):
+        """Test get_usage_audit_logs() writes a .jsonl output_path as JSON Lines"""
+        output_path = str(tmp_path / "logs.jsonl")
+
+        row_count = your_class_instance.get_usage_audit_logs(
+            your_class_instance.company_id,
+            "2022-01-01",
+            "2022-06-30",
+            output_path=output_path,
+        )
+
+        with open(output_path, "r", encoding="utf-8") as json_file:
+            logs = [json.loads(line) for line in json_file]
+
+        assert row_count == len(logs) == len(expected_pages) * 2
+        assert [(log["startDate"], log["page"]) for log in logs] == [
+            page for page in expected_pages for _ in range(2)
+        ]
+
+    def test_get_usage_audit_logs_json_output(
+        self, your_class_instance, requested_pages, tmp_path
+    ):
+        """Test get_usage_audit_logs() writes a .json output_path as a JSON list"""
+        output_path = str(tmp_path / "logs.json")
+
+        row_count = your_class_instance.get_usage_audit_logs(
+            your_class_instance.company_id,
+            "2022-01-01",
+            "2022-01-31",
+            output_path=output_path,
+        )
+
+        with open(output_path, "r", encoding="utf-8") as json_file:
+            logs = json.load(json_file)
+
+        assert row_count == len(logs) == self.TOTAL_PAGES * 2
+        assert logs[0] == {"startDate": "2022-01-01T00:00:00", "page": 0}
+
+    def test_get_usage_audit_logs_output_page_failure(
+        self, your_class_instance, requested_pages, failing_pages, tmp_path
+    ):
+        """Test get_usage_audit_logs() leaves no output file if a page fails"""
+        failing_pages.add(("2022-04-01T00:00:00", 2))
+        output_path = str(tmp_path / "logs.jsonl")
+
+        with pytest.raises(RequestFailure):
+            your_class_instance.get_usage_audit_logs(
+                your_class_instance.company_id,
+                "2022-01-01",
+                "2022-06-30",
+                output_path=output_path,
+            )
+
+        assert not os.path.exists(output_path)
+        assert not os.path.exists(output_path + ".tmp")
+
+
+class TestPostCsv:
+    """Test class for validate_csv() and bulk_data_insertion()"""
+
+    @pytest.fixture
+    def your_class_instance(self):
+        """Fixture to instantiate your class"""
+        return AdobeAPI()
+
+    @pytest.fixture
+    def csv_data(self):
+        """Fixture to provide the bytes of a bulk import CSV file"""
+        return (
+            ",".join(AdobeAPI.BULK_IMPORT_COLUMNS)
+            + "\r\ntest-rsid,1643673600,,,,,,,,,,,\r\n"
+        ).encode("utf-8")
+
+    @pytest.fixture
+    def csv_file_path(self, csv_data, tmp_path):
+        """Fixture to write the CSV file"""
+        csv_file_path = str(tmp_path / "logs.csv")
+        with open(csv_file_path, "wb") as csv_file:
+            csv_file.write(csv_data)
+        return csv_file_path
+
+    @pytest.fixture
+    def gzip_file_path(self, csv_data, tmp_path):
+        """Fixture to write the CSV file already gzipped"""
+        gzip_file_path = str(tmp_path / "logs.csv.gz")
+        with gzip.open(gzip_file_path, "wb") as gzip_file:
+            gzip_file.write(csv_data)
+        return gzip_file_path
+
+    @pytest.fixture
+    def posted_files(self, your_class_instance, monkeypatch):
+        """
+        Fixture to replace session.post, recording the url, file name, file data and
+        headers of each CSV upload
+        """
+        posted_files = []
+
+        def fake_post(url, files=None, json=None, headers=None, timeout=None):
+            response = requests.Response()
+            response.status_code = 200
+
+            if files is None:
+                # The existing data check, which finds no existing data
+                response._content = b'{"summaryData": {"totals": [0]}}'
+                return response
+
+            file_name, file_data = files["file"]
+            if hasattr(file_data, "read"):
+                file_data = file_data.read()
+            posted_files.append((url, file_name, file_data, headers))
+            response._content = b'{"success": true}'
+            return response
+
+        monkeypatch.setattr(your_class_instance.session, "post", fake_post)
+        return posted_files
+
+    def assert_posted_file(self, your_class_instance, posted_file, url, csv_data):
+        """Assert a CSV upload was sent gzipped, with its headers only on the request"""
+        posted_url, file_name, file_data, headers = posted_file
+
+        assert posted_url == url
+        assert file_name == "logs.csv.gz"
+        assert gzip.decompress(file_data) == csv_data
+        assert headers["x-adobe-vgid"] == "usage_group1"
+        assert "x-adobe-vgid" not in your_class_instance.session.headers
+
+    def test_validate_csv(
+        self, your_class_instance, posted_files, csv_file_path, csv_data
+    ):
+        """Test validate_csv() gzips a plain CSV file before sending it"""
+        assert your_class_instance.validate_csv(csv_file_path) == {"success": True}
+
+        assert len(posted_files) == 1
+        self.assert_posted_file(
+            your_class_instance,
+            posted_files[0],
+            "https://analytics-collection.adobe.io/aa/collect/v1/events/validate",
+            csv_data,
+        )
+
+    def test_validate_csv_gzipped(
+        self, your_class_instance, posted_files, gzip_file_path, csv_data
+    ):
+        """Test validate_csv() sends an already gzipped CSV file as it is"""
+        your_class_instance.validate_csv(gzip_file_path)
+
+        with open(gzip_file_path, "rb") as gzip_file:
+            assert posted_files[0][2] == gzip_file.read()
+        self.assert_posted_file(
+            your_class_instance,
+            posted_files[0],
+            "https://analytics-collection.adobe.io/aa/collect/v1/events/validate",
+            csv_data,
+        )
+
+    def test_bulk_data_insertion(
+        self, your_class_instance, posted_files, csv_file_path, csv_data
+    ):
+        """Test bulk_data_insertion() validates and then sends a plain CSV file"""
+        your_class_instance.bulk_data_insertion(csv_file_path)
+
+        assert [posted_file[0] for posted_file in posted_files] == [
+            "https://analytics-collection.adobe.io/aa/collect/v1/events/validate",
+            "https://analytics-collection.adobe.io/aa/collect/v1/events",
+        ]
+        for posted_file in posted_files:
+            self.assert_posted_file(
+                your_class_instance, posted_file, posted_file[0], csv_data
+            )
+
+    def test_bulk_data_insertion_gzipped(
+        self, your_class_instance, posted_files, gzip_file_path, csv_data
+    ):
+        """Test bulk_data_insertion() with an already gzipped CSV file"""
+        your_class_instance.bulk_data_insertion(gzip_file_path)
+
+        assert len(posted_files) == 2
+        for posted_file in posted_files:
+            self.assert_posted_file(
+                your_class_instance, posted_file, posted_file[0], csv_data
+            )
+
+
+class TestReadLogs:
+    """Test class for _read_logs()"""
+
+    @pytest.fixture
+    def your_class_instance(self):
+        """Fixture to instantiate your class"""
+        return AdobeAPI()
+
+    @pytest.fixture
+    def json_data(self):
+        """Fixture to provide sample JSON data"""
+        return [
+            {"eventType": "2", "eventDescription": "Login successful [a, b]"},
+            {"eventType": 61, "eventDescription": "Api Method", "extra": [1.25, None]},
+            {},
+        ]
+
+    @pytest.fixture
+    def json_file(self, json_data):
+        """Fixture to create a temporary JSON file"""
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.write(fd, json.dumps(json_data, indent=4).encode("utf-8"))
+        os.close(fd)
+        yield path
+        os.remove(path)
+
+    def test_read_logs_json_list(self, your_class_instance, json_file, json_data):
+        """Test _read_logs() with a JSON list"""
+        assert list(your_class_instance._read_logs(json_file)) == json_data
+
+    def test_read_logs_json_lines(self, your_class_instance, json_data, tmp_path):
+        """Test _read_logs() with a JSON Lines file, skipping blank lines"""
+        jsonl_file = str(tmp_path / "logs.jsonl")
+        with open(jsonl_file, "w", encoding="utf-8") as temp_file:
+            temp_file.write("\n".join(json.dumps(log) for log in json_data) + "\n\n")
+
+        assert list(your_class_instance._read_logs(jsonl_file)) == json_data
+
+    def test_read_logs_json_list_empty(self, your_class_instance, json_file):
+        """Test _read_logs() with an empty JSON list"""
+        with open(json_file, "w", encoding="utf-8") as temp_file:
+            temp_file.write(" [ ] ")
+
+        assert list(your_class_instance._read_logs(json_file)) == []
+
+    def test_read_logs_invalid_json(self, your_class_instance, json_file):
+        """Test _read_logs() with a truncated JSON list"""
+        with open(json_file, "w", encoding="utf-8") as temp_file:
+            temp_file.write('[{"eventType": "2"}, {"eventType": ')
+
+        with pytest.raises(ValueError):
+            list(your_class_instance._read_logs(json_file))
+
+    def test_read_logs_trailing_comma(self, your_class_instance, json_file):
+        """Test _read_logs() with a comma after the last item of a JSON list"""
+        with open(json_file, "w", encoding="utf-8") as temp_file:
+            temp_file.write("[1, 2,]")
+
+        with pytest.raises(ValueError):
+            list(your_class_instance._read_logs(json_file))
+
+    def test_read_logs_extra_data(self, your_class_instance, json_file):
+        """Test _read_logs() with text after the end of a JSON list"""
+        with open(json_file, "w", encoding="utf-8") as temp_file:
+            temp_file.write("[1, 2] \n trailing")
+
+        with pytest.raises(ValueError):
+            list(your_class_instance._read_logs(json_file))